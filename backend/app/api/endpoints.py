@@ -1,46 +1,434 @@
 """API endpoints for data access."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Optional, List, Tuple, Dict, Iterator
+from functools import lru_cache
 import polars as pl
+import pyarrow.parquet as pq
+import bisect
+import hashlib
+import io
 import json
+import time
 
 from app.models import DataResponse, DataSummary, SchemaResponse
 
+# Handlers are plain ``def``: their parquet reads and Polars work block, so
+# FastAPI runs them in its threadpool instead of on the event loop. Polars
+# releases the GIL while executing, so concurrent requests run in parallel.
 router = APIRouter(prefix="/api", tags=["data"])
 
 # Path to processed data (relative to backend directory)
 # Go up from: backend/app/api/endpoints.py -> backend -> project root -> pipeline -> processed_data
 PROCESSED_DATA_DIR = Path(__file__).parent.parent.parent.parent / "pipeline" / "processed_data"
 
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows serialized per chunk when streaming NDJSON
+NDJSON_CHUNK_ROWS = 100
+
+# Bit widths used to range-check integer filter values
+INTEGER_BITS = {
+    pl.Int8: 8, pl.Int16: 16, pl.Int32: 32, pl.Int64: 64,
+    pl.UInt8: 8, pl.UInt16: 16, pl.UInt32: 32, pl.UInt64: 64,
+}
+
+# Seconds browsers/CDNs may reuse a /data response before revalidating its ETag
+DATA_CACHE_MAX_AGE = 60
+
+# How long (in seconds) a latest-dataset lookup is reused before re-checking the directory
+LATEST_DATASET_TTL = 1.0
+
+_latest_dataset_cache = {"path": None, "dir_mtime_ns": None, "checked_at": float("-inf")}
+
 
 def get_latest_dataset() -> Optional[Path]:
-    """Find the most recent processed dataset."""
+    """
+    Find the most recent processed dataset.
+    
+    The result is reused for LATEST_DATASET_TTL seconds; after that only the
+    directory mtime is checked, and the directory is re-globbed only when a
+    file has been added, removed or renamed into place by the pipeline.
+    """
+    now = time.monotonic()
+    if now - _latest_dataset_cache["checked_at"] < LATEST_DATASET_TTL:
+        return _latest_dataset_cache["path"]
+    _latest_dataset_cache["checked_at"] = now
+    
+    try:
+        dir_mtime_ns = PROCESSED_DATA_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
+        dir_mtime_ns = None
+    if dir_mtime_ns is not None and dir_mtime_ns == _latest_dataset_cache["dir_mtime_ns"]:
+        return _latest_dataset_cache["path"]
+    
     parquet_files = list(PROCESSED_DATA_DIR.glob("*.parquet"))
-    if not parquet_files:
-        return None
     # Return most recently modified file
-    return max(parquet_files, key=lambda p: p.stat().st_mtime)
+    latest = max(parquet_files, key=lambda p: p.stat().st_mtime) if parquet_files else None
+    
+    _latest_dataset_cache["path"] = latest
+    _latest_dataset_cache["dir_mtime_ns"] = dir_mtime_ns
+    return latest
+
 
+@lru_cache(maxsize=4)
+def _footer_meta(path_str: str, mtime_ns: int) -> Tuple[int, pl.Schema]:
+    """
+    Read row count and schema from the parquet footer once per (path, mtime).
+    
+    The Arrow schema is converted through an empty table so the dtype names
+    match what Polars reports for the loaded data.
+    """
+    parquet_file = pq.ParquetFile(path_str)
+    schema = pl.from_arrow(parquet_file.schema_arrow.empty_table()).schema
+    return parquet_file.metadata.num_rows, schema
 
-def load_dataset() -> pl.DataFrame:
-    """Load the processed dataset."""
+
+def require_dataset() -> Path:
+    """Return the latest dataset path, or raise 404 if there is none."""
     dataset_path = get_latest_dataset()
     if not dataset_path:
         raise HTTPException(
             status_code=404,
             detail="No processed dataset found. Run the data pipeline first."
         )
-    return pl.read_parquet(dataset_path)
+    return dataset_path
+
+
+def dataset_metadata() -> Tuple[int, pl.Schema]:
+    """Row count and schema of the processed dataset, without reading any data."""
+    dataset_path = require_dataset()
+    return _footer_meta(str(dataset_path), dataset_path.stat().st_mtime_ns)
+
+
+def read_sample(dataset_path: Path, n: int = 10) -> pl.DataFrame:
+    """Read the first ``n`` rows, decoding only the first row group."""
+    parquet_file = pq.ParquetFile(dataset_path)
+    if parquet_file.num_row_groups == 0:
+        return pl.from_arrow(parquet_file.schema_arrow.empty_table())
+    return pl.from_arrow(parquet_file.read_row_group(0).slice(0, n))
+
+
+def fresh_sidecar(dataset_path: Path, suffix: str) -> Optional[Path]:
+    """
+    Return the pipeline-written ``<dataset>.<suffix>`` file if it is up to date.
+    
+    A sidecar older than its parquet file is ignored so a partially re-run
+    pipeline never serves stale metadata.
+    """
+    sidecar_path = dataset_path.with_name(f"{dataset_path.name}.{suffix}")
+    try:
+        if sidecar_path.stat().st_mtime_ns >= dataset_path.stat().st_mtime_ns:
+            return sidecar_path
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def read_sorted_page(
+    dataset_path: Path,
+    sort_index_path: Path,
+    descending: bool,
+    offset: int,
+    length: int,
+    columns: List[str],
+) -> pl.DataFrame:
+    """
+    Fetch one sorted page using a sort index precomputed by the pipeline.
+    
+    Only ``length`` row numbers are read from the index; the rows are then
+    taken from just the row groups that contain them, decoding only the
+    requested columns, so no sort runs per request.
+    """
+    row_ids = (
+        pl.scan_ipc(sort_index_path)
+        .select("desc" if descending else "asc")
+        .slice(offset, length)
+        .collect()
+        .to_series()
+        .to_list()
+    )
+    parquet_file = pq.ParquetFile(dataset_path)
+    if not row_ids:
+        return pl.from_arrow(parquet_file.schema_arrow.empty_table().select(columns))
+    
+    # First row number of every row group in the file
+    group_starts = []
+    next_start = 0
+    for i in range(parquet_file.num_row_groups):
+        group_starts.append(next_start)
+        next_start += parquet_file.metadata.row_group(i).num_rows
+    
+    row_groups = [bisect.bisect_right(group_starts, row) - 1 for row in row_ids]
+    selected = sorted(set(row_groups))
+    table = parquet_file.read_row_groups(selected, columns=columns)
+    
+    # Position of each selected row group's first row within ``table``
+    table_starts = {}
+    next_start = 0
+    for group in selected:
+        table_starts[group] = next_start
+        next_start += parquet_file.metadata.row_group(group).num_rows
+    
+    positions = [
+        table_starts[group] + row - group_starts[group]
+        for row, group in zip(row_ids, row_groups)
+    ]
+    return pl.from_arrow(table.take(positions))
+
+
+def parse_filter_value(value: str, dtype: pl.DataType) -> Any:
+    """
+    Parse a query-string value into a Python value of column dtype ``dtype``.
+    
+    Plain casts cannot turn strings into temporal or boolean values, so those
+    are parsed explicitly. Raises ValueError or a PolarsError on bad input.
+    """
+    series = pl.Series([value])
+    if dtype == pl.Boolean:
+        lowered = value.lower()
+        if lowered not in ("true", "false"):
+            raise ValueError(value)
+        return lowered == "true"
+    if dtype == pl.Date:
+        return series.str.to_date().item()
+    if dtype == pl.Time:
+        return series.str.to_time().item()
+    if dtype == pl.Datetime:
+        parsed = series.str.to_datetime(time_unit=dtype.time_unit, time_zone=dtype.time_zone)
+        if dtype.time_zone is None and parsed.dtype.time_zone is not None:
+            # An explicit offset on a naive column is compared in UTC
+            parsed = parsed.dt.convert_time_zone("UTC").dt.replace_time_zone(None)
+        return parsed.item()
+    return series.cast(dtype).item()
+
+
+def parse_filters(filters: List[str], schema: pl.Schema) -> List[pl.Expr]:
+    """
+    Turn ``column:value`` query strings into equality predicates.
+    
+    Values are parsed to the column's dtype up front so a bad filter is
+    reported as a 400 rather than failing inside the query.
+    """
+    predicates = []
+    for item in filters:
+        col, sep, value = item.partition(":")
+        if not sep or col not in schema:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {item!r}")
+        dtype = schema[col]
+        if dtype in INTEGER_BITS:
+            # The pipeline narrows integer columns to fit their data, so a valid
+            # integer outside the column's range simply matches no rows
+            try:
+                int_value = int(value)
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid value for column {col!r} ({dtype}): {value!r}"
+                )
+            bits = INTEGER_BITS[dtype]
+            low, high = (0, 2**bits - 1) if dtype.is_unsigned_integer() else (-2**(bits - 1), 2**(bits - 1) - 1)
+            if not low <= int_value <= high:
+                predicates.append(pl.lit(False))
+                continue
+        try:
+            typed_value = parse_filter_value(value, dtype)
+        except (pl.exceptions.PolarsError, ValueError):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid value for column {col!r} ({dtype}): {value!r}"
+            )
+        predicates.append(pl.col(col) == pl.lit(typed_value, dtype=dtype))
+    return predicates
+
+
+def without_binary(dtype: pl.DataType) -> pl.DataType:
+    """``dtype`` with every Binary, including nested ones, replaced by String."""
+    if dtype == pl.Binary:
+        return pl.String
+    if isinstance(dtype, pl.List):
+        return pl.List(without_binary(dtype.inner))
+    if isinstance(dtype, pl.Array):
+        return pl.Array(without_binary(dtype.inner), dtype.shape)
+    if isinstance(dtype, pl.Struct):
+        return pl.Struct({field.name: without_binary(field.dtype) for field in dtype.fields})
+    return dtype
+
+
+def json_ready(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Convert columns so ``write_json`` produces what the Pydantic models used
+    to: ISO 8601 datetimes (``2020-01-01T10:00:00.123456``, ``...Z``),
+    ISO durations (``P1D``) and Binary values as UTF-8 strings.
+    
+    ``write_json`` would otherwise emit a space-separated datetime, ``+00:00``
+    for UTC and second-based durations, and it cannot serialize Binary at all.
+    The pipeline writes summary.json samples with the same conversion.
+    """
+    exprs = []
+    for col, dtype in df.schema.items():
+        if dtype == pl.Datetime:
+            micros = pl.col(col).dt.microsecond()
+            parts = [
+                pl.col(col).dt.to_string("%Y-%m-%dT%H:%M:%S"),
+                pl.when(micros != 0).then(pl.lit(".") + micros.cast(pl.String).str.zfill(6)).otherwise(pl.lit("")),
+            ]
+            if dtype.time_zone is not None:
+                parts.append(pl.col(col).dt.to_string("%:z").str.replace(r"^\+00:00$", "Z"))
+            exprs.append(pl.concat_str(parts).alias(col))
+        elif dtype == pl.Duration:
+            exprs.append(pl.col(col).dt.to_string("iso").alias(col))
+        elif without_binary(dtype) != dtype:
+            exprs.append(pl.col(col).cast(without_binary(dtype)))
+    return df.with_columns(exprs) if exprs else df
+
+
+def iter_ndjson(df: pl.DataFrame, chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield ``df`` as newline-delimited JSON, a chunk of rows at a time."""
+    df = json_ready(df)
+    for offset in range(0, df.height, chunk_rows):
+        yield df.slice(offset, chunk_rows).write_ndjson().encode()
+
+
+def pagination_headers(total: int, page: int, page_size: int, total_pages: int) -> Dict[str, str]:
+    """Pagination metadata for responses whose body holds only rows."""
+    return {
+        "X-Total": str(total),
+        "X-Page": str(page),
+        "X-Page-Size": str(page_size),
+        "X-Total-Pages": str(total_pages),
+    }
+
+
+def json_envelope(key: str, records: pl.DataFrame, **fields) -> bytes:
+    """
+    Build a JSON object holding ``records`` under ``key`` plus scalar ``fields``.
+    
+    Rows are serialized by Polars directly to bytes, so no per-row Python
+    dicts are created and the stdlib encoder never sees them.
+    """
+    body = b'{' + json.dumps(key).encode() + b':' + json_ready(records).write_json().encode()
+    for name, value in fields.items():
+        body += b',' + json.dumps(name).encode() + b':' + json.dumps(value).encode()
+    return body + b'}'
+
+
+def query_page(
+    path_str: str,
+    mtime_ns: int,
+    page: int,
+    page_size: int,
+    sort_by: Optional[str],
+    sort_desc: bool,
+    columns: Tuple[str, ...],
+    filters: Tuple[str, ...],
+) -> Tuple[pl.DataFrame, int]:
+    """Run the query for one page; returns the page rows and the (filtered) row total."""
+    dataset_path = Path(path_str)
+    lf = pl.scan_parquet(dataset_path)
+    total, schema = _footer_meta(path_str, mtime_ns)
+    
+    if columns:
+        unknown = [col for col in columns if col not in schema]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown column(s): {', '.join(unknown)}")
+    
+    # Filters are pushed into the parquet reader, which skips row groups
+    # whose statistics cannot match; the total then needs a (pruned) count
+    if filters:
+        lf = lf.filter(parse_filters(list(filters), schema))
+        total = lf.select(pl.len()).collect().item()
+    
+    start_idx = (page - 1) * page_size
+    
+    # Unfiltered sorts use the pipeline's precomputed sort index when it is fresh
+    sort_index_path = None
+    if sort_by and sort_by in schema and not filters:
+        position = schema.names().index(sort_by)
+        sort_index_path = fresh_sidecar(dataset_path, f"sort{position}.idx")
+    
+    if sort_index_path:
+        df_page = read_sorted_page(
+            dataset_path,
+            sort_index_path,
+            sort_desc,
+            start_idx,
+            page_size,
+            list(columns) or schema.names()
+        )
+    else:
+        # Apply sorting if requested (sort column is validated against the footer schema).
+        # Polars folds the following slice into the sort as a top-k and uses
+        # parquet statistics to skip row groups that cannot reach the page.
+        # maintain_order keeps ties in file order so pages never overlap.
+        if sort_by and sort_by in schema:
+            lf = lf.sort(sort_by, descending=sort_desc, maintain_order=True)
+        
+        # Apply pagination; only the requested page is materialized
+        lf = lf.slice(start_idx, page_size)
+        # Projection is applied last so sorting/filtering may use any column;
+        # Polars still decodes only the columns the query touches
+        if columns:
+            lf = lf.select(list(columns))
+        df_page = lf.collect()
+    
+    return df_page, total
 
 
-@router.get("/data", response_model=DataResponse)
-async def get_data(
+@lru_cache(maxsize=256)
+def _render_page(
+    path_str: str,
+    mtime_ns: int,
+    page: int,
+    page_size: int,
+    sort_by: Optional[str],
+    sort_desc: bool,
+    columns: Tuple[str, ...],
+    filters: Tuple[str, ...],
+    format: str,
+) -> Tuple[bytes, str, Tuple[Tuple[str, str], ...]]:
+    """
+    Render a json/arrow page to (body, media type, headers).
+    
+    Memoized per dataset (path, mtime), so paging back and forth costs no
+    Polars work or encoding; entries for replaced files age out of the LRU.
+    """
+    df_page, total = query_page(path_str, mtime_ns, page, page_size, sort_by, sort_desc, columns, filters)
+    total_pages = (total + page_size - 1) // page_size
+    
+    if format == "arrow":
+        buf = io.BytesIO()
+        df_page.write_ipc_stream(buf)
+        headers = pagination_headers(total, page, page_size, total_pages)
+        return buf.getvalue(), ARROW_STREAM_MEDIA_TYPE, tuple(headers.items())
+    
+    # Serialize the page straight to JSON bytes (same shape as DataResponse)
+    body = json_envelope(
+        "data",
+        df_page,
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages
+    )
+    return body, "application/json", ()
+
+
+# Row payloads are returned as pre-serialized Responses; the models below only
+# document the response shape and are never used to validate the rows.
+@router.get("/data", response_model=None, responses={200: {"model": DataResponse}})
+def get_data(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
     sort_by: Optional[str] = Query(None, description="Column to sort by"),
     sort_desc: bool = Query(False, description="Sort in descending order"),
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$", description="Response format: json, ndjson or arrow"),
+    columns: Optional[List[str]] = Query(None, description="Columns to return (default: all)"),
+    filters: Optional[List[str]] = Query(None, alias="filter", description="Equality filter as column:value (repeatable)"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Get paginated data from the processed dataset.
@@ -48,75 +436,106 @@ async def get_data(
     Supports:
     - Pagination
     - Sorting
+    - Column selection and equality filters, pushed down into the parquet scan
+    - Streamed NDJSON (``format=ndjson``) and Arrow IPC stream (``format=arrow``)
+      output, with pagination in X-* headers
+    - ETag / If-None-Match revalidation; json and arrow bodies are memoized
     """
     try:
-        df = load_dataset()
-        
-        # Apply sorting if requested
-        if sort_by and sort_by in df.columns:
-            df = df.sort(sort_by, descending=sort_desc)
-        
-        # Calculate pagination
-        total = len(df)
-        total_pages = (total + page_size - 1) // page_size
+        dataset_path = require_dataset()
+        mtime_ns = dataset_path.stat().st_mtime_ns
+        key = (
+            str(dataset_path),
+            mtime_ns,
+            page,
+            page_size,
+            sort_by,
+            sort_desc,
+            # Repeated column names are dropped (first occurrence wins)
+            tuple(dict.fromkeys(columns or ())),
+            tuple(filters or ()),
+        )
         
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        df_page = df.slice(start_idx, page_size)
+        # The ETag changes whenever the dataset is rewritten or the query differs
+        digest = hashlib.sha1(repr(key + (format,)).encode()).hexdigest()[:16]
+        cache_headers = {
+            "ETag": f'W/"{mtime_ns}-{digest}"',
+            "Cache-Control": f"public, max-age={DATA_CACHE_MAX_AGE}",
+        }
+        if if_none_match and cache_headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=cache_headers)
         
-        # Convert to dict records
-        data = df_page.to_dicts()
+        if format == "ndjson":
+            # Rows are encoded as they are sent, so the whole rendered body is never held
+            df_page, total = query_page(*key)
+            total_pages = (total + page_size - 1) // page_size
+            return StreamingResponse(
+                iter_ndjson(df_page),
+                media_type=NDJSON_MEDIA_TYPE,
+                headers={**pagination_headers(total, page, page_size, total_pages), **cache_headers}
+            )
         
-        return DataResponse(
-            data=data,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        body, media_type, headers = _render_page(*key, format)
+        return Response(content=body, media_type=media_type, headers={**dict(headers), **cache_headers})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading data: {str(e)}")
 
 
-@router.get("/summary", response_model=DataSummary)
-async def get_summary():
+@router.get("/summary", response_model=None, responses={200: {"model": DataSummary}})
+def get_summary():
     """Get summary statistics and sample data."""
     try:
-        df = load_dataset()
-        dataset_path = get_latest_dataset()
+        dataset_path = require_dataset()
         
-        # Extract source filename from processed file name
-        # e.g., "fifa_eda_stats.parquet" -> "fifa_eda_stats.csv"
-        source_filename = None
-        if dataset_path:
-            # Remove .parquet extension and assume .csv source
-            source_filename = dataset_path.stem + ".csv"
+        # Serve the summary precomputed by the pipeline when available
+        summary_path = fresh_sidecar(dataset_path, "summary.json")
+        if summary_path:
+            return FileResponse(summary_path, media_type="application/json")
+        
+        total_rows, schema = dataset_metadata()
+        column_types = {col: str(dtype) for col, dtype in schema.items()}
         
         # Get sample (first 10 rows)
-        sample_df = df.head(10)
+        sample_df = read_sample(dataset_path, 10)
         
-        return DataSummary(
-            total_rows=len(df),
-            columns=df.columns,
-            column_types={col: str(df[col].dtype) for col in df.columns},
-            sample_data=sample_df.to_dicts(),
-            source_filename=source_filename
+        # Serialize straight to JSON bytes (same shape as DataSummary)
+        body = json_envelope(
+            "sample_data",
+            sample_df,
+            total_rows=total_rows,
+            columns=list(column_types),
+            column_types=column_types,
+            # Only summary.json records the raw file (CSV or Parquet) it came from
+            source_filename=None
         )
+        return Response(content=body, media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading summary: {str(e)}")
 
 
 @router.get("/schema", response_model=SchemaResponse)
-async def get_schema():
+def get_schema():
     """Get schema information for the dataset."""
     try:
-        df = load_dataset()
+        # Serve the schema file written by the pipeline when available
+        schema_path = fresh_sidecar(require_dataset(), "schema.json")
+        if schema_path:
+            return FileResponse(schema_path, media_type="application/json")
+        
+        # Otherwise schema and row count come from the parquet footer; no data pages are read
+        row_count, schema = dataset_metadata()
+        dtypes = {col: str(dtype) for col, dtype in schema.items()}
         
         return SchemaResponse(
-            columns=df.columns,
-            dtypes={col: str(df[col].dtype) for col in df.columns},
-            row_count=len(df)
+            columns=list(dtypes),
+            dtypes=dtypes,
+            row_count=row_count
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading schema: {str(e)}")
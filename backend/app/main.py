@@ -10,6 +10,7 @@ This backend:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.endpoints import router
 
@@ -26,8 +27,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination metadata for format=ndjson and format=arrow responses, and ETags
+    expose_headers=["X-Total", "X-Page", "X-Page-Size", "X-Total-Pages", "ETag"],
 )
 
+# Compress responses; JSON rows repeat every key, so pages shrink several-fold
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.include_router(router)
 
 @app.get("/")
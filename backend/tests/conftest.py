@@ -0,0 +1,38 @@
+"""Shared fixtures: run the pipeline into a temporary processed_data directory."""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import endpoints
+from app.main import app
+from pipeline import DataPipeline
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_dataset(tmp_path, monkeypatch):
+    """Return a function that runs the pipeline on a DataFrame and serves the result."""
+    raw_dir = tmp_path / "raw_data"
+    processed_dir = tmp_path / "processed_data"
+    raw_dir.mkdir()
+    monkeypatch.setattr(endpoints, "PROCESSED_DATA_DIR", processed_dir)
+    
+    def make(df: pl.DataFrame, **pipeline_kwargs) -> Path:
+        df.write_parquet(raw_dir / "data.parquet")
+        output_path = DataPipeline(str(raw_dir), str(processed_dir), **pipeline_kwargs).process_file("data.parquet")
+        # Forget cached lookups so the new file is picked up immediately
+        endpoints._latest_dataset_cache.update(path=None, dir_mtime_ns=None, checked_at=float("-inf"))
+        endpoints._footer_meta.cache_clear()
+        endpoints._render_page.cache_clear()
+        return output_path
+    
+    yield make
+    endpoints._latest_dataset_cache.update(path=None, dir_mtime_ns=None, checked_at=float("-inf"))
+    endpoints._render_page.cache_clear()
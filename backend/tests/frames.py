@@ -0,0 +1,35 @@
+"""DataFrames shared by the API tests."""
+
+import datetime as dt
+
+import polars as pl
+
+
+def mixed_frame(n: int = 60) -> pl.DataFrame:
+    """Small frame with ties and nulls in every sortable column."""
+    return pl.DataFrame({
+        "k": [None if i % 7 == 0 else i % 4 for i in range(n)],
+        "s": [None if i % 5 == 0 else "abc"[i % 3] for i in range(n)],
+        "v": [None if i % 11 == 0 else float(i % 6) / 2 for i in range(n)],
+        "i": list(range(n)),
+    })
+
+
+def temporal_frame() -> pl.DataFrame:
+    return pl.DataFrame({
+        "d": [dt.date(2020, 1, 1), dt.date(2020, 1, 2), None],
+        "b": [True, False, None],
+        "ts": [dt.datetime(2020, 1, 1, 10, 0, 0, 123456), dt.datetime(2020, 1, 1, 11), None],
+        "tz": pl.Series([dt.datetime(2020, 1, 1, 10), dt.datetime(2020, 1, 1, 11, 0, 0, 5), None])
+            .dt.replace_time_zone("UTC"),
+        "dur": [dt.timedelta(days=1), dt.timedelta(seconds=90, microseconds=5), None],
+        "k": [1, 2, 3],
+    })
+
+
+def binary_frame() -> pl.DataFrame:
+    return pl.DataFrame({
+        "raw": [b"abc", b"", None],
+        "nested": [[b"x"], None, []],
+        "k": [1, 2, 3],
+    })
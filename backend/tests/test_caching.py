@@ -0,0 +1,65 @@
+"""Tests for dataset lookup and response caching in the API."""
+
+import os
+
+import polars as pl
+
+from app.api import endpoints
+from frames import mixed_frame
+
+
+def test_latest_dataset_rechecks_directory_after_ttl(tmp_path, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(endpoints.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(endpoints, "PROCESSED_DATA_DIR", tmp_path)
+    monkeypatch.setattr(endpoints, "_latest_dataset_cache", {"path": None, "dir_mtime_ns": None, "checked_at": float("-inf")})
+
+    def write(name: str, mtime_ns: int):
+        path = tmp_path / name
+        pl.DataFrame({"a": [1]}).write_parquet(path)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        # Set explicitly: two writes within one timestamp tick would share a directory mtime
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    first = write("first.parquet", 10**18)
+    assert endpoints.get_latest_dataset() == first
+
+    second = write("second.parquet", 2 * 10**18)
+    # Within the TTL the cached path is returned without touching the directory
+    clock[0] += endpoints.LATEST_DATASET_TTL / 2
+    assert endpoints.get_latest_dataset() == first
+
+    clock[0] += endpoints.LATEST_DATASET_TTL
+    assert endpoints.get_latest_dataset() == second
+
+    # A file mtime change alone does not trigger a re-glob; only the directory is checked
+    os.utime(first, ns=(3 * 10**18, 3 * 10**18))
+    clock[0] += 2 * endpoints.LATEST_DATASET_TTL
+    assert endpoints.get_latest_dataset() == second
+
+
+def test_if_none_match_returns_304(client, make_dataset):
+    make_dataset(mixed_frame())
+
+    first = client.get("/api/data", params={"page": 2, "page_size": 5})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/data", params={"page": 2, "page_size": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    other = client.get("/api/data", params={"page": 3, "page_size": 5}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["ETag"] != etag
+
+
+def test_etag_changes_when_dataset_is_rewritten(client, make_dataset):
+    make_dataset(mixed_frame())
+    etag = client.get("/api/data").headers["ETag"]
+
+    make_dataset(mixed_frame(30))
+    response = client.get("/api/data", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 30
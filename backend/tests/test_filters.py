@@ -0,0 +1,44 @@
+"""Tests for column selection and filters on /api/data."""
+
+import pytest
+
+from frames import mixed_frame, temporal_frame
+
+
+def test_filters_parse_column_types(client, make_dataset):
+    make_dataset(temporal_frame())
+
+    def matched(value: str) -> list:
+        response = client.get("/api/data", params={"filter": value, "columns": "k"})
+        assert response.status_code == 200, response.text
+        return [row["k"] for row in response.json()["data"]]
+
+    assert matched("d:2020-01-02") == [2]
+    assert matched("b:true") == [1]
+    assert matched("b:False") == [2]
+    assert matched("ts:2020-01-01 11:00:00") == [2]
+    assert matched("tz:2020-01-01T10:00:00Z") == [1]
+
+
+@pytest.mark.parametrize("value", ["k:abc", "k:1.5", "d:not-a-date", "b:maybe", "missing:1", "no-separator"])
+def test_invalid_filter_returns_400(client, make_dataset, value):
+    make_dataset(temporal_frame())
+    response = client.get("/api/data", params={"filter": value})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("value", ["k:1000", "k:-1", "d:1999-01-01"])
+def test_valid_filter_without_matches_returns_empty_page(client, make_dataset, value):
+    # k is narrowed to a small integer type by the pipeline
+    make_dataset(temporal_frame())
+    response = client.get("/api/data", params={"filter": value})
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+    assert response.json()["total"] == 0
+
+
+def test_repeated_columns_are_deduplicated(client, make_dataset):
+    make_dataset(mixed_frame())
+    response = client.get("/api/data", params={"columns": ["k", "i", "k"], "page_size": 2})
+    assert response.status_code == 200
+    assert list(response.json()["data"][0]) == ["k", "i"]
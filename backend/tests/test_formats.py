@@ -0,0 +1,102 @@
+"""Tests for the /api/data and /api/summary response formats."""
+
+import io
+import json
+
+import polars as pl
+
+import pipeline
+from app.api import endpoints
+from app.models import DataResponse, DataSummary
+from frames import binary_frame, mixed_frame, temporal_frame
+
+
+def test_json_temporals_match_previous_encoder(client, make_dataset):
+    output_path = make_dataset(temporal_frame())
+    df = pl.read_parquet(output_path)
+
+    expected_data = json.loads(
+        DataResponse(data=df.to_dicts(), total=3, page=1, page_size=100, total_pages=1).model_dump_json()
+    )
+    assert client.get("/api/data").json() == expected_data
+    assert expected_data["data"][0]["ts"] == "2020-01-01T10:00:00.123456"
+    assert expected_data["data"][0]["tz"] == "2020-01-01T10:00:00Z"
+    assert expected_data["data"][0]["dur"] == "P1D"
+
+    ndjson = [json.loads(line) for line in client.get("/api/data", params={"format": "ndjson"}).text.splitlines()]
+    assert ndjson == expected_data["data"]
+
+    expected_sample = json.loads(DataSummary(
+        total_rows=3,
+        columns=df.columns,
+        column_types={col: str(dtype) for col, dtype in df.schema.items()},
+        sample_data=df.to_dicts(),
+    ).model_dump_json())["sample_data"]
+    # Precomputed summary.json, then the fallback once it is removed
+    assert client.get("/api/summary").json()["sample_data"] == expected_sample
+    output_path.with_name(f"{output_path.name}.summary.json").unlink()
+    assert client.get("/api/summary").json()["sample_data"] == expected_sample
+
+
+def test_json_binary_matches_previous_encoder(client, make_dataset):
+    output_path = make_dataset(binary_frame())
+    df = pl.read_parquet(output_path)
+
+    expected_data = json.loads(
+        DataResponse(data=df.to_dicts(), total=3, page=1, page_size=100, total_pages=1).model_dump_json()
+    )
+    assert client.get("/api/data").json() == expected_data
+    assert [row["raw"] for row in expected_data["data"]] == ["abc", "", None]
+
+    ndjson = [json.loads(line) for line in client.get("/api/data", params={"format": "ndjson"}).text.splitlines()]
+    assert ndjson == expected_data["data"]
+
+    output_path.with_name(f"{output_path.name}.summary.json").unlink()
+    assert client.get("/api/summary").json()["sample_data"] == expected_data["data"]
+
+
+def test_summary_sidecar_sample_matches_fallback(client, make_dataset):
+    df = pl.concat([temporal_frame(), binary_frame().drop("k")], how="horizontal")
+    output_path = make_dataset(df)
+    assert pipeline.json_ready(df).write_json() == endpoints.json_ready(df).write_json()
+
+    from_sidecar = client.get("/api/summary").json()
+    output_path.with_name(f"{output_path.name}.summary.json").unlink()
+    assert client.get("/api/summary").json()["sample_data"] == from_sidecar["sample_data"]
+
+
+def test_arrow_page_matches_json_page(client, make_dataset):
+    make_dataset(mixed_frame(25))
+    params = {"page": 2, "page_size": 10, "sort_by": "i", "sort_desc": True}
+
+    response = client.get("/api/data", params={**params, "format": "arrow"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == endpoints.ARROW_STREAM_MEDIA_TYPE
+    assert (
+        response.headers["X-Total"],
+        response.headers["X-Page"],
+        response.headers["X-Page-Size"],
+        response.headers["X-Total-Pages"],
+    ) == ("25", "2", "10", "3")
+
+    page = pl.read_ipc_stream(io.BytesIO(response.content))
+    assert page.to_dicts() == client.get("/api/data", params=params).json()["data"]
+    assert page["i"].to_list() == list(range(14, 4, -1))
+
+
+def test_gzip_is_negotiated(client, make_dataset):
+    make_dataset(mixed_frame(500))
+    params = {"page_size": 500}
+
+    compressed = client.get("/api/data", params=params, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["vary"]
+
+    plain = client.get("/api/data", params=params, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    # httpx decompresses the gzip body transparently
+    assert compressed.json() == plain.json()
+
+    # Bodies under the middleware's minimum_size are sent uncompressed
+    small = client.get("/api/data", params={"page_size": 1, "columns": "k"}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
@@ -0,0 +1,76 @@
+"""Tests for the pipeline's processed output and sidecar files."""
+
+import json
+
+import polars as pl
+import pytest
+
+import pipeline
+from pipeline import DataPipeline
+
+
+def run_pipeline(tmp_path, df: pl.DataFrame, **pipeline_kwargs):
+    raw_dir = tmp_path / "raw_data"
+    raw_dir.mkdir()
+    df.write_parquet(raw_dir / "data.parquet")
+    return DataPipeline(str(raw_dir), str(tmp_path / "processed_data"), **pipeline_kwargs).process_file("data.parquet")
+
+
+def test_summary_sidecar_serializes_binary_columns(tmp_path):
+    df = pl.DataFrame({
+        "k": [1, 2, 3],
+        "raw": [b"abc", b"", None],
+        "nested": [[b"x"], None, []],
+    })
+    output_path = run_pipeline(tmp_path, df)
+
+    summary = json.loads(output_path.with_name(f"{output_path.name}.summary.json").read_text())
+    assert [row["raw"] for row in summary["sample_data"]] == ["abc", "", None]
+    assert [row["nested"] for row in summary["sample_data"]] == [["x"], None, []]
+    assert summary["column_types"]["raw"] == "Binary"
+
+
+def test_validate_schema_casts_lazily(tmp_path):
+    lf = pl.LazyFrame({"a": ["1", "2"], "b": [1.5, 2.5], "c": ["x", "y"]})
+    validated = DataPipeline(str(tmp_path), str(tmp_path)).validate_schema(lf, {"a": pl.Int64, "b": pl.Float64})
+
+    assert isinstance(validated, pl.LazyFrame)
+    assert validated.collect_schema() == pl.Schema({"a": pl.Int64, "b": pl.Float64, "c": pl.String})
+    assert validated.collect()["a"].to_list() == [1, 2]
+
+
+def test_validate_schema_lists_missing_columns(tmp_path):
+    lf = pl.LazyFrame({"a": [1]})
+    with pytest.raises(ValueError, match="b, c"):
+        DataPipeline(str(tmp_path), str(tmp_path)).validate_schema(lf, {"a": pl.Int64, "b": pl.Int64, "c": pl.String})
+
+
+@pytest.mark.parametrize("argv, float_dtype, string_dtype", [
+    ([], pl.Float64, pl.String),
+    (["--float32", "--categorical", "0.6"], pl.Float32, pl.Categorical),
+])
+def test_float32_and_categorical_narrowing_is_opt_in(tmp_path, monkeypatch, argv, float_dtype, string_dtype):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "raw_data").mkdir()
+    (tmp_path / "processed_data").mkdir()
+    pl.DataFrame({
+        "small": [1, 2, 3, 4],
+        "unsigned": pl.Series([0, 70000, 1, 2], dtype=pl.UInt64),
+        "value": [0.5, 1.5, 2.5, None],
+        "category": ["a", "b", "a", "a"],
+        "label": ["w", "x", "y", "z"],
+    }).write_parquet(tmp_path / "raw_data" / "data.parquet")
+    monkeypatch.setattr("sys.argv", ["pipeline.py", "-f", "data.parquet", *argv])
+    pipeline.main()
+
+    output = pl.read_parquet(tmp_path / "processed_data" / "data.parquet")
+    # Integers are always narrowed, keeping their signedness; mostly unique strings stay strings
+    assert {col: dtype.base_type() for col, dtype in output.schema.items()} == {
+        "small": pl.Int8,
+        "unsigned": pl.UInt32,
+        "value": float_dtype,
+        "category": string_dtype,
+        "label": pl.String,
+    }
+    assert output["value"].to_list() == [0.5, 1.5, 2.5, None]
+    assert output["category"].cast(pl.String).to_list() == ["a", "b", "a", "a"]
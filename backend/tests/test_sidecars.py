@@ -0,0 +1,39 @@
+"""Tests for serving the pipeline's summary/schema sidecar files."""
+
+import json
+import os
+
+from frames import mixed_frame
+
+
+def test_summary_source_filename(client, make_dataset):
+    output_path = make_dataset(mixed_frame())
+    assert client.get("/api/summary").json()["source_filename"] == "data.parquet"
+
+    # Without summary.json the raw file name is unknown
+    output_path.with_name(f"{output_path.name}.summary.json").unlink()
+    assert client.get("/api/summary").json()["source_filename"] is None
+
+
+def test_stale_sidecars_are_ignored(client, make_dataset):
+    output_path = make_dataset(mixed_frame(30))
+    summary_path = output_path.with_name(f"{output_path.name}.summary.json")
+    schema_path = output_path.with_name(f"{output_path.name}.schema.json")
+    assert client.get("/api/schema").json()["row_count"] == 30
+
+    # Sidecars left behind by an older run: wrong contents, older than the parquet
+    old_ns = output_path.stat().st_mtime_ns - 10**9
+    for path in (summary_path, schema_path):
+        info = json.loads(path.read_text())
+        info.update(total_rows=1, row_count=1)
+        path.write_text(json.dumps(info))
+        os.utime(path, ns=(old_ns, old_ns))
+
+    summary = client.get("/api/summary").json()
+    assert summary["total_rows"] == 30
+    assert summary["source_filename"] is None
+    assert client.get("/api/schema").json() == {
+        "columns": ["k", "s", "v", "i"],
+        "dtypes": json.loads(schema_path.read_text())["dtypes"],
+        "row_count": 30,
+    }
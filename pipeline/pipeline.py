@@ -10,21 +10,118 @@ This pipeline:
 
 import polars as pl
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, List
 import json
+import os
 import argparse
 
 
+# Parquet layout tuned for the API's reads: footer statistics let the backend
+# skip row groups when sorting/slicing, and ~64k-row groups keep the amount
+# decoded per page request small without hurting full-scan throughput.
+PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "statistics": True,
+    "row_group_size": 65_536,
+    "data_page_size": 1 << 20,
+}
+
+# Integer types tried in order when narrowing, with their value ranges
+NARROW_SIGNED = [
+    (pl.Int8, (-2**7, 2**7 - 1)),
+    (pl.Int16, (-2**15, 2**15 - 1)),
+    (pl.Int32, (-2**31, 2**31 - 1)),
+    (pl.Int64, (-2**63, 2**63 - 1)),
+]
+NARROW_UNSIGNED = [
+    (pl.UInt8, (0, 2**8 - 1)),
+    (pl.UInt16, (0, 2**16 - 1)),
+    (pl.UInt32, (0, 2**32 - 1)),
+    (pl.UInt64, (0, 2**64 - 1)),
+]
+FLOAT32_MAX = 3.4028234663852886e38
+
+# Columns the dashboard sorts by, indexed by default (each costs two full sorts)
+SORTABLE: List[str] = []
+
+
+def without_binary(dtype: pl.DataType) -> pl.DataType:
+    """``dtype`` with every Binary, including nested ones, replaced by String."""
+    if dtype == pl.Binary:
+        return pl.String
+    if isinstance(dtype, pl.List):
+        return pl.List(without_binary(dtype.inner))
+    if isinstance(dtype, pl.Array):
+        return pl.Array(without_binary(dtype.inner), dtype.shape)
+    if isinstance(dtype, pl.Struct):
+        return pl.Struct({field.name: without_binary(field.dtype) for field in dtype.fields})
+    return dtype
+
+
+def json_ready(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Prepare the summary sample for ``write_json``, so summary.json holds the
+    same values the API serves for the rows (``backend/app/api/endpoints.py``
+    keeps the matching helper; the backend tests compare the two).
+    
+    Datetimes become ISO 8601 strings with a ``T`` separator and ``Z`` for
+    UTC, durations ISO strings such as ``P1D``, and Binary values UTF-8
+    strings. ``write_json`` cannot serialize Binary at all.
+    """
+    exprs = []
+    for col, dtype in df.schema.items():
+        if dtype == pl.Datetime:
+            micros = pl.col(col).dt.microsecond()
+            parts = [
+                pl.col(col).dt.to_string("%Y-%m-%dT%H:%M:%S"),
+                pl.when(micros != 0).then(pl.lit(".") + micros.cast(pl.String).str.zfill(6)).otherwise(pl.lit("")),
+            ]
+            if dtype.time_zone is not None:
+                parts.append(pl.col(col).dt.to_string("%:z").str.replace(r"^\+00:00$", "Z"))
+            exprs.append(pl.concat_str(parts).alias(col))
+        elif dtype == pl.Duration:
+            exprs.append(pl.col(col).dt.to_string("iso").alias(col))
+        elif without_binary(dtype) != dtype:
+            exprs.append(pl.col(col).cast(without_binary(dtype)))
+    return df.with_columns(exprs) if exprs else df
+
+
+def write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write ``path`` through ``write`` into a temporary file, then rename it
+    into place so the API never reads a partial file.
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
 class DataPipeline:
     """Processes raw data into clean, structured datasets."""
     
-    def __init__(self, raw_data_dir: str = "raw_data", output_dir: str = "processed_data"):
+    def __init__(
+        self,
+        raw_data_dir: str = "raw_data",
+        output_dir: str = "processed_data",
+        drop_empty_rows: bool = True,
+        sort_index_columns: Optional[List[str]] = None,
+        downcast_floats: bool = False,
+        categorical_threshold: Optional[float] = None,
+    ):
         self.raw_data_dir = Path(raw_data_dir)
         self.output_dir = Path(output_dir)
+        # Skip the all-null row filter for sources known not to contain empty rows
+        self.drop_empty_rows = drop_empty_rows
+        # Columns to precompute sort indexes for (None = SORTABLE)
+        self.sort_index_columns = SORTABLE if sort_index_columns is None else sort_index_columns
+        # Lossy/opt-in dtype narrowing (see narrow_dtypes); integers are always narrowed
+        self.downcast_floats = downcast_floats
+        self.categorical_threshold = categorical_threshold
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def load_raw_data(self, filename: str) -> pl.DataFrame:
-        """Load raw data from file (CSV or Parquet)."""
+    def build_lazy(self, filename: str) -> pl.LazyFrame:
+        """Lazily scan raw data from file (CSV or Parquet)."""
         file_path = self.raw_data_dir / filename
         
         if not file_path.exists():
@@ -32,27 +129,33 @@ class DataPipeline:
         
         # Auto-detect format
         if filename.endswith('.csv'):
-            df = pl.read_csv(file_path)
+            lf = pl.scan_csv(file_path)
         elif filename.endswith('.parquet'):
-            df = pl.read_parquet(file_path)
+            lf = pl.scan_parquet(file_path)
         else:
             raise ValueError(f"Unsupported file format: {filename}")
         
-        return df
+        return lf
     
-    def validate_schema(self, df: pl.DataFrame, expected_schema: Optional[dict] = None) -> pl.DataFrame:
-        """Validate that the dataframe matches expected structure."""
+    def validate_schema(self, lf: pl.LazyFrame, expected_schema: Optional[dict] = None) -> pl.LazyFrame:
+        """Validate that the frame matches expected structure."""
         if expected_schema:
-            for col, dtype in expected_schema.items():
-                if col not in df.columns:
-                    raise ValueError(f"Missing required column: {col}")
-                # Coerce types if needed
-                if df[col].dtype != dtype:
-                    df = df.with_columns(pl.col(col).cast(dtype))
-        
-        return df
+            schema = lf.collect_schema()
+            missing = [col for col in expected_schema if col not in schema]
+            if missing:
+                raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+            # Coerce types if needed, all casts in a single pass
+            casts = [
+                pl.col(col).cast(dtype)
+                for col, dtype in expected_schema.items()
+                if schema[col] != dtype
+            ]
+            if casts:
+                lf = lf.with_columns(casts)
+        
+        return lf
     
-    def transform_data(self, df: pl.DataFrame) -> pl.DataFrame:
+    def transform_data(self, lf: pl.LazyFrame) -> pl.LazyFrame:
         """
         Transform raw data into meaningful metrics.
         
@@ -62,6 +165,9 @@ class DataPipeline:
         - Aggregations
         - Metric calculations
         - Data quality fixes
+        
+        Works on a LazyFrame so the whole pipeline runs as a single
+        streaming query when the result is sunk to parquet.
         """
         # Example transformation: ensure proper types and add computed fields
         # Customize this based on your actual data schema
@@ -69,17 +175,110 @@ class DataPipeline:
         # Remove rows where ALL columns are null (truly empty rows only)
         # Note: We keep rows with some nulls - real-world datasets have optional fields
         # Only filter out rows that are completely empty
-        df = df.filter(pl.any_horizontal(pl.col("*").is_not_null()))
+        columns = lf.collect_schema().names()
+        if self.drop_empty_rows and columns:
+            # Explicit column list avoids wildcard expansion; any_horizontal is a
+            # single vectorized OR across the columns
+            lf = lf.filter(pl.any_horizontal([pl.col(c).is_not_null() for c in columns]))
         
         # If there are date columns, parse them
-        # df = df.with_columns(pl.col("date").str.to_date())
+        # lf = lf.with_columns(pl.col("date").str.to_date())
         
         # Add any computed metrics here
-        # df = df.with_columns(
+        # lf = lf.with_columns(
         #     (pl.col("value") * pl.col("multiplier")).alias("total_value")
         # )
         
-        return df
+        # Store every column in the narrowest type that holds its values
+        lf = self.narrow_dtypes(lf)
+        
+        return lf
+    
+    def narrow_dtypes(self, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """
+        Cast columns to narrower dtypes so less data is stored, scanned and served.
+        
+        - Integers: narrowest type of the same signedness that holds min/max
+        - Float64 -> Float32 when ``downcast_floats`` is set (loses precision)
+        - Strings -> Categorical when unique/rows is below ``categorical_threshold``
+        
+        Column statistics are gathered in one aggregate query (an extra scan of
+        the source) and all casts are applied in a single ``with_columns``.
+        """
+        schema = lf.collect_schema()
+        int_cols, float_cols, str_cols = [], [], []
+        for col, dtype in schema.items():
+            if dtype.is_integer():
+                int_cols.append(col)
+            elif dtype == pl.Float64 and self.downcast_floats:
+                float_cols.append(col)
+            elif dtype == pl.String and self.categorical_threshold:
+                str_cols.append(col)
+        if not (int_cols or float_cols or str_cols):
+            return lf
+        
+        stats = lf.select(
+            [pl.len().alias("__rows")]
+            + [pl.col(c).min().alias(f"{c}__min") for c in int_cols]
+            + [pl.col(c).max().alias(f"{c}__max") for c in int_cols]
+            + [pl.col(c).abs().max().alias(f"{c}__absmax") for c in float_cols]
+            + [pl.col(c).n_unique().alias(f"{c}__nunique") for c in str_cols]
+        ).collect().row(0, named=True)
+        
+        casts = []
+        for col in int_cols:
+            low, high = stats[f"{col}__min"], stats[f"{col}__max"]
+            if low is None:
+                continue
+            candidates = NARROW_UNSIGNED if schema[col].is_unsigned_integer() else NARROW_SIGNED
+            for dtype, (dtype_min, dtype_max) in candidates:
+                if dtype_min <= low and high <= dtype_max:
+                    if dtype != schema[col]:
+                        casts.append(pl.col(col).cast(dtype))
+                    break
+        for col in float_cols:
+            abs_max = stats[f"{col}__absmax"]
+            if abs_max is not None and abs_max <= FLOAT32_MAX:
+                casts.append(pl.col(col).cast(pl.Float32))
+        for col in str_cols:
+            rows = stats["__rows"]
+            if rows and stats[f"{col}__nunique"] / rows < self.categorical_threshold:
+                casts.append(pl.col(col).cast(pl.Categorical))
+        
+        if casts:
+            lf = lf.with_columns(casts)
+        return lf
+    
+    def write_sort_indexes(self, output_path: Path) -> List[str]:
+        """
+        Precompute sorted row permutations for the API's /data endpoint.
+        
+        For each column in ``sort_index_columns`` that exists in the output,
+        with ``i`` its position, this writes ``<output>.sort<i>.idx``, an Arrow
+        IPC file with UInt32 ``asc`` and ``desc`` columns holding row numbers
+        in sorted order. Ordering matches the API's fallback sort: nulls first
+        and ties kept in file order. Returns the indexed column names.
+        """
+        lf = pl.scan_parquet(output_path)
+        schema = lf.collect_schema()
+        
+        indexed = []
+        for position, (col, dtype) in enumerate(schema.items()):
+            if col not in self.sort_index_columns or dtype.is_nested():
+                continue
+            # Row numbers come from int_range, so no helper column can clash with the data
+            permutations = lf.select(
+                pl.int_range(pl.len(), dtype=pl.UInt32)
+                .sort_by(col, descending=descending, maintain_order=True)
+                .alias(direction)
+                for direction, descending in (("asc", False), ("desc", True))
+            ).collect()
+            write_atomic(
+                output_path.with_name(f"{output_path.name}.sort{position}.idx"),
+                permutations.write_ipc
+            )
+            indexed.append(col)
+        return indexed
     
     def process_file(self, filename: str, output_name: Optional[str] = None) -> Path:
         """
@@ -89,31 +288,53 @@ class DataPipeline:
         """
         print(f"Processing {filename}...")
         
-        # Load raw data
-        df = self.load_raw_data(filename)
-        print(f"  Loaded {len(df)} rows, {len(df.columns)} columns")
+        # Scan raw data (nothing is read until the result is sunk)
+        lf = self.build_lazy(filename)
+        print(f"  Scanning {len(lf.collect_schema())} columns")
         
         # Validate (optional schema validation)
-        # df = self.validate_schema(df, expected_schema={...})
+        # lf = self.validate_schema(lf, expected_schema={...})
         
         # Transform
-        df = self.transform_data(df)
-        print(f"  Transformed to {len(df)} rows")
+        lf = self.transform_data(lf)
         
-        # Save processed data
+        # Stream processed data to parquet in a single pass
         output_name = output_name or filename.replace('.csv', '.parquet').replace('.parquet', '.parquet')
         output_path = self.output_dir / output_name
-        df.write_parquet(output_path)
+        # Written atomically, which also changes the directory mtime (the API watches it)
+        write_atomic(output_path, lambda path: lf.sink_parquet(path, **PARQUET_WRITE_OPTIONS))
+        
+        # Save metadata/schema (row count comes from the parquet footer)
+        output_lf = pl.scan_parquet(output_path)
+        output_schema = output_lf.collect_schema()
+        row_count = output_lf.select(pl.len()).collect().item()
+        print(f"  Transformed to {row_count} rows")
         
-        # Save metadata/schema
         schema_path = self.output_dir / f"{output_name}.schema.json"
+        dtypes = {col: str(dtype) for col, dtype in output_schema.items()}
         schema_info = {
-            "columns": df.columns,
-            "dtypes": {col: str(df[col].dtype) for col in df.columns},
-            "row_count": len(df)
+            "columns": list(dtypes),
+            "dtypes": dtypes,
+            "row_count": row_count
+        }
+        write_atomic(schema_path, lambda path: path.write_text(json.dumps(schema_info, indent=2)))
+        
+        # Save precomputed summary (served as-is by the API's /summary endpoint)
+        summary_path = self.output_dir / f"{output_name}.summary.json"
+        sample_df = output_lf.head(10).collect()
+        summary_info = {
+            "total_rows": row_count,
+            "columns": schema_info["columns"],
+            "column_types": schema_info["dtypes"],
+            "sample_data": json.loads(json_ready(sample_df).write_json()),
+            "source_filename": filename
         }
-        with open(schema_path, 'w') as f:
-            json.dump(schema_info, f, indent=2)
+        write_atomic(summary_path, lambda path: path.write_text(json.dumps(summary_info, indent=2)))
+        
+        # Save sort indexes so sorted pages can be served without a full sort
+        indexed = self.write_sort_indexes(output_path)
+        if indexed:
+            print(f"  Indexed {len(indexed)} columns for sorting")
         
         print(f"  Saved to {output_path}")
         return output_path
@@ -136,9 +357,36 @@ Examples:
         type=str,
         help='Specific file to process (e.g., sample_data.csv). If not specified, processes all files.'
     )
+    parser.add_argument(
+        '--keep-empty-rows',
+        action='store_true',
+        help='Skip the filter that drops rows where every column is null.'
+    )
+    parser.add_argument(
+        '--sort-index',
+        action='append',
+        metavar='COLUMN',
+        help='Precompute a sort index for COLUMN (repeatable). Defaults to SORTABLE in pipeline.py.'
+    )
+    parser.add_argument(
+        '--float32',
+        action='store_true',
+        help='Store Float64 columns as Float32 (smaller output, less precision).'
+    )
+    parser.add_argument(
+        '--categorical',
+        type=float,
+        metavar='RATIO',
+        help='Store string columns as Categorical when unique values / rows is below RATIO (e.g. 0.5).'
+    )
     
     args = parser.parse_args()
-    pipeline = DataPipeline()
+    pipeline = DataPipeline(
+        drop_empty_rows=not args.keep_empty_rows,
+        sort_index_columns=args.sort_index,
+        downcast_floats=args.float32,
+        categorical_threshold=args.categorical,
+    )
     
     if args.file:
         # Process only the specified file